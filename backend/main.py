@@ -1,19 +1,24 @@
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 import os
+import re
+import sys
+import ijson
 import json
+import orjson
+import time
 import uuid
 import asyncio
 import logging
-import subprocess
+import shutil
 import tempfile
+from collections import OrderedDict
 from datetime import datetime
 from typing import List, Optional, Dict
 from pydantic import BaseModel
-import threading
 
-app = FastAPI(title="Maigret OSINT API", version="1.0.0")
+app = FastAPI(title="Maigret OSINT API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -24,8 +29,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+# Setup logging (override with e.g. LOG_LEVEL=DEBUG)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 # WebSocket connection manager
@@ -44,23 +49,25 @@ class ConnectionManager:
             logger.info(f"WebSocket disconnected for session {session_id}")
 
     async def send_progress_update(self, session_id: str, data: dict):
-        logger.debug(f"Attempting to send progress update to session {session_id}")
-        logger.debug(f"Active connections: {list(self.active_connections.keys())}")
-        
+        # Lazy %-formatting throughout: this runs per progress frame, so the
+        # connection-list and payload strings are only built under DEBUG
+        logger.debug("Attempting to send progress update to session %s", session_id)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Active connections: %s", list(self.active_connections))
+
         if session_id in self.active_connections:
             try:
-                message_json = json.dumps(data)
-                logger.debug(f"Sending message to session {session_id}: {message_json}")
+                # orjson keeps the per-frame encode cost off the hot progress loop
+                message_json = orjson.dumps(data, default=str).decode()
+                logger.debug("Sending message to session %s: %s", session_id, message_json)
                 await self.active_connections[session_id].send_text(message_json)
-                logger.debug(f"Successfully sent progress update to session {session_id}")
+                logger.debug("Successfully sent progress update to session %s", session_id)
             except Exception as e:
                 logger.error(f"Failed to send progress update to session {session_id}: {e}")
                 logger.error(f"Exception type: {type(e).__name__}")
-                logger.error(f"Exception details: {str(e)}")
                 self.disconnect(session_id)
         else:
-            logger.warning(f"No active WebSocket connection for session {session_id}")
-            logger.debug(f"Available sessions: {list(self.active_connections.keys())}")
+            logger.debug("No active WebSocket connection for session %s", session_id)
 
 manager = ConnectionManager()
 
@@ -92,58 +99,365 @@ class SearchResponse(BaseModel):
 
 # In-memory storage for demo purposes
 # In production, use a proper database
-search_sessions = {}
-session_locks = {}  # Per-session locks for thread safety
+# Kept as an LRU bounded by MAX_LIVE_SESSIONS; older sessions are evicted
+# from memory (their sessions/<id>.json file remains) and reloaded on demand.
+search_sessions: OrderedDict = OrderedDict()
+
+MAX_LIVE_SESSIONS = int(os.getenv("MAX_LIVE_SESSIONS", "256"))
 
-# Session persistence
-SESSIONS_FILE = "search_sessions.json"
+# Session persistence: one file per session so an update only rewrites the
+# session that changed, not the whole store.
+SESSIONS_DIR = "sessions"
+LEGACY_SESSIONS_FILE = "search_sessions.json"
 
 def load_sessions():
-    """Load sessions from file"""
+    """Load sessions from the per-session files (migrating the legacy single file)"""
     global search_sessions
+    search_sessions = OrderedDict()
     try:
-        if os.path.exists(SESSIONS_FILE):
-            with open(SESSIONS_FILE, 'r') as f:
-                search_sessions = json.load(f)
-                logger.info(f"Loaded {len(search_sessions)} sessions from file")
+        if os.path.isdir(SESSIONS_DIR):
+            for name in os.listdir(SESSIONS_DIR):
+                if not name.endswith('.json'):
+                    continue
+                with open(os.path.join(SESSIONS_DIR, name), 'rb') as f:
+                    search_sessions[name[:-len('.json')]] = orjson.loads(f.read())
+        elif os.path.exists(LEGACY_SESSIONS_FILE):
+            # One-time migration from the old single-file store
+            with open(LEGACY_SESSIONS_FILE, 'rb') as f:
+                search_sessions = OrderedDict(orjson.loads(f.read()))
+            for session_id in search_sessions:
+                save_session(session_id)
+        logger.info(f"Loaded {len(search_sessions)} sessions")
     except Exception as e:
         logger.error(f"Failed to load sessions: {e}")
-        search_sessions = {}
+        search_sessions = OrderedDict()
+    evict_old_sessions()
+
+def _write_session_file(session_id: str, data: bytes):
+    """Write pre-serialized session bytes to its own file (atomic rename)"""
+    try:
+        os.makedirs(SESSIONS_DIR, exist_ok=True)
+        path = os.path.join(SESSIONS_DIR, f"{session_id}.json")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.error(f"Failed to save session {session_id}: {e}")
+
+def save_session(session_id: str):
+    """Save a single session, keeping the file write off the event loop
+
+    Serialization happens on the calling thread (cheap with orjson, and safe
+    against concurrent mutation); the disk write runs in the default executor
+    when an event loop is running so it never blocks request handling.
+    """
+    try:
+        # Compact encoding: session files are machine-read only, and skipping
+        # indentation roughly halves the bytes written per flush
+        data = orjson.dumps(search_sessions[session_id], default=str)
+    except Exception as e:
+        logger.error(f"Failed to serialize session {session_id}: {e}")
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _write_session_file(session_id, data)
+    else:
+        loop.run_in_executor(None, _write_session_file, session_id, data)
+
+# Debounced persistence: progress updates arrive per output line, but the
+# on-disk copy only needs to keep up roughly once a second. Terminal status
+# changes (completed/failed) always flush immediately.
+_dirty_sessions = set()
+_last_flush = 0.0
+FLUSH_INTERVAL = 1.0
+
+def maybe_flush_sessions(force: bool = False):
+    """Flush dirty sessions to disk once the debounce interval has passed"""
+    global _last_flush
+    if not _dirty_sessions:
+        return
+    if force or (time.monotonic() - _last_flush) > FLUSH_INTERVAL:
+        for session_id in list(_dirty_sessions):
+            save_session(session_id)
+        _dirty_sessions.clear()
+        _last_flush = time.monotonic()
+
+def evict_old_sessions():
+    """Evict least-recently-used sessions from memory once over the cap"""
+    while len(search_sessions) > MAX_LIVE_SESSIONS:
+        old_id = next(iter(search_sessions))
+        if old_id in _dirty_sessions:
+            save_session(old_id)
+            _dirty_sessions.discard(old_id)
+        search_sessions.pop(old_id)
+        _status_cache.pop(old_id, None)
+        logger.debug(f"Evicted session {old_id} from memory")
 
-def save_sessions():
-    """Save sessions to file"""
+def load_session_from_disk(session_id: str) -> Optional[dict]:
+    """Reload a previously evicted session from its file"""
+    path = os.path.join(SESSIONS_DIR, f"{session_id}.json")
     try:
-        with open(SESSIONS_FILE, 'w') as f:
-            json.dump(search_sessions, f, indent=2, default=str)
-        logger.info(f"Saved {len(search_sessions)} sessions to file")
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                return orjson.loads(f.read())
     except Exception as e:
-        logger.error(f"Failed to save sessions: {e}")
+        logger.error(f"Failed to reload session {session_id}: {e}")
+    return None
+
+# Browsers poll /api/search/{id} every few hundred ms; cache the encoded
+# status response briefly so a polling burst reuses one build+encode. Every
+# session update invalidates the entry, so state changes are never delayed.
+STATUS_CACHE_TTL = 0.2
+_status_cache: Dict[str, tuple] = {}
 
 def update_session_data(session_id: str, updates: dict):
-    """Thread-safe session data update"""
-    if session_id not in session_locks:
-        session_locks[session_id] = threading.Lock()
-    
-    with session_locks[session_id]:
-        if session_id in search_sessions:
-            search_sessions[session_id].update(updates)
-            logger.debug(f"Session {session_id} updated: {updates}")
-            save_sessions()
-        else:
-            logger.warning(f"Session {session_id} not found for update")
+    """Update a session in place
+
+    Every caller runs on the event-loop thread, so no locking is needed;
+    serialization for disk happens against a consistent snapshot because
+    save_session encodes before yielding to the executor.
+    """
+    if session_id in search_sessions:
+        search_sessions[session_id].update(updates)
+        search_sessions.move_to_end(session_id)
+        logger.debug("Session %s updated: %s", session_id, updates)
+        _status_cache.pop(session_id, None)
+        _dirty_sessions.add(session_id)
+        maybe_flush_sessions(force=updates.get("status") in ("completed", "failed"))
+    else:
+        logger.warning(f"Session {session_id} not found for update")
 
 def get_session_data(session_id: str) -> dict:
-    """Thread-safe session data retrieval"""
-    if session_id not in session_locks:
-        session_locks[session_id] = threading.Lock()
-    
-    with session_locks[session_id]:
-        return search_sessions.get(session_id, {}).copy()
+    """Get a session dict (reloading evicted sessions from disk)
+
+    Returns a reference, not a copy — callers only read from it, and
+    copying sessions that hold full result sets was the dominant cost of
+    the per-line progress parsing.
+    """
+    if session_id in search_sessions:
+        search_sessions.move_to_end(session_id)
+        return search_sessions[session_id]
+    session = load_session_from_disk(session_id)
+    if session is not None:
+        search_sessions[session_id] = session
+        evict_old_sessions()
+        return session
+    return {}
+
+# Precompiled patterns for parsing Maigret's verbose output. The parse loop
+# runs once per stdout line, so the patterns are compiled once here instead
+# of going through the re cache on every line.
+SITES_COUNT_RE = re.compile(r'(\d+)\s+sites?', re.IGNORECASE)
+
+# All line formats fused into one alternation so each output line costs a
+# single regex pass instead of one re.search per individual pattern. The
+# branch that fired is identified by its named group.
+OUTPUT_LINE_RE = re.compile(
+    # Progress counters: "Searching |██░░| 494/500", "Progress: 12/500",
+    # "494/500 [99%]", "12/500 [===  ]", "12/500 sites"
+    r'(?P<progress>'
+    r'(?:Searching\s+\|[█░]+\|\s*|Progress:\s+)(?P<done>\d+)/(?P<total>\d+)'
+    r'|(?P<done2>\d+)/(?P<total2>\d+)\s+(?:\[(?P<pct>\d+)%\]|\[[█░=# ]+\]|sites?)'
+    r')'
+    # Visual progress bar with no counter
+    r'|(?P<bar>Searching\s+\|(?P<fill>[█░]+)\|)'
+    # Site currently being checked
+    r'|(?P<site>'
+    r'(?:Checking|Searching|Testing)\s+(?P<site_name>[^.\s|]+)'
+    r'|\[(?P<bracket_site>[^\]]+)\]\s+(?:Checking|Searching)'
+    r')'
+    # A result hit
+    r'|(?P<result>(?i:Found!|Claimed|✓|\[FOUND\]|\[CLAIMED\]|Success))'
+)
+
+# Tokens one of which must be present for OUTPUT_LINE_RE to possibly match;
+# the substring check keeps the regex engine off plain log lines entirely
+_MATCH_TOKENS = ('/', '|', '[', 'checking', 'searching', 'testing', 'found', 'claim', '✓', 'success')
+
+def _line_can_match(line: str) -> bool:
+    lowered = line.lower()
+    return any(tok in lowered for tok in _MATCH_TOKENS)
+
+# Shared normalized status strings: every site row references one of these
+# instead of allocating a fresh .title() result per entry
+_STATUS_NORMALIZE = {
+    "claimed": "Claimed", "Claimed": "Claimed", "CLAIMED": "Claimed",
+    "unclaimed": "Unclaimed", "Unclaimed": "Unclaimed", "UNCLAIMED": "Unclaimed",
+}
+
+def _to_site_result(site_name: str, site_data: dict) -> dict:
+    """Convert one Maigret report entry to the frontend site format"""
+    status = site_data.get("status", {})
+    # Normalize status to match frontend expectations
+    raw_status = status.get("status", "unknown") if isinstance(status, dict) else str(status)
+
+    return {
+        # The same ~3000 site names recur for every username searched;
+        # interning shares one string object across all result sets
+        "siteName": sys.intern(site_name),
+        "url": site_data.get("url_main", ""),
+        "status": _STATUS_NORMALIZE.get(raw_status, raw_status),
+        "tags": site_data.get("tags", []) if "tags" in site_data else [],
+        "metadata": site_data.get("metadata", {}),
+        "urlUser": site_data.get("url_user", "")
+    }
+
+# Option-to-flag table for the Maigret command line; a None formatter marks
+# a boolean flag, anything else converts the option value to the argument
+BASE_CMD = ("python3", "-m", "maigret.maigret")
+
+_FLAG_MAP = (
+    ("timeout", "--timeout", str),
+    ("allSites", "--all-sites", None),
+    ("tags", "--tags", ",".join),
+    ("disableRecursiveSearch", "--no-recursion", None),
+    ("disableExtracting", "--no-extracting", None),
+    ("proxy", "--proxy", str),
+    ("torProxy", "--tor-proxy", str),
+    ("i2pProxy", "--i2p-proxy", str),
+)
+
+def build_maigret_cmd(options: SearchOptions, usernames: List[str], report_dir: str) -> list:
+    """Build the Maigret command line for a search request"""
+    cmd = list(BASE_CMD)
+    for attr, flag, fmt in _FLAG_MAP:
+        value = getattr(options, attr)
+        if not value:
+            continue
+        if fmt is None:
+            cmd.append(flag)
+        else:
+            cmd.extend((flag, fmt(value)))
+
+    if not options.allSites and options.topSites:
+        cmd.extend(("--top-sites", str(options.topSites)))
+    for site in options.siteList:
+        cmd.extend(("--site", site))
+
+    # Verbose output for progress tracking, JSON reports into the
+    # per-search temp directory
+    cmd.append("--verbose")
+    cmd.extend(("--json", "simple"))
+    cmd.extend(("--folderoutput", report_dir))
+    cmd.extend(usernames)
+    return cmd
+
+def _find_user_reports(report_dir: str, usernames: List[str]) -> Dict[str, str]:
+    """Map usernames to their report file paths with one directory scan
+
+    A single scandir replaces a stat call per username; usernames with no
+    report simply stay absent from the mapping.
+    """
+    reports = {}
+    prefix, suffix = "report_", "_simple.json"
+    try:
+        for entry in os.scandir(report_dir):
+            name = entry.name
+            if name.startswith(prefix) and name.endswith(suffix):
+                reports[name[len(prefix):-len(suffix)]] = entry.path
+    except OSError as e:
+        logger.error(f"Failed to scan report directory {report_dir}: {e}")
+    return {username: reports[username] for username in usernames if username in reports}
+
+def _load_user_results(username: str, json_path: Optional[str]) -> dict:
+    """Load and format one username's report (runs in a worker thread)"""
+    user_results = {
+        "username": username,
+        "sites": [],
+        "extractedData": {},
+        "networkGraph": []
+    }
+
+    if json_path is not None:
+        logger.debug("Found JSON file for %s", username)
+        with open(json_path, 'rb') as f:
+            # The report is the sites dict directly (e.g., {"YouTube": {...}, "YouTube User": {...}})
+            user_results["sites"] = [
+                _to_site_result(site_name, site_data)
+                for site_name, site_data in ijson.kvitems(f, '')
+                if isinstance(site_data, dict) and "status" in site_data
+            ]
+    else:
+        logger.warning(f"JSON file not found for {username}")
+
+    return user_results
 
 # Load sessions on startup
 load_sessions()
 
-MAIGRET_AVAILABLE = True  # Re-enable Maigret with WebSocket support
+@app.on_event("startup")
+async def start_session_flusher():
+    """Periodically flush dirty sessions.
+
+    The inline debounce in update_session_data only writes when another
+    update arrives; this loop picks up sessions left dirty after a burst.
+    """
+    async def _flush_loop():
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            maybe_flush_sessions(force=True)
+
+    asyncio.create_task(_flush_loop())
+
+@app.on_event("shutdown")
+async def flush_sessions_on_shutdown():
+    maybe_flush_sessions(force=True)
+
+# Assume Maigret is available until the async startup probe says otherwise;
+# the probe never blocks serving, and a failed probe flips searches to mock
+MAIGRET_AVAILABLE = True
+
+@app.on_event("startup")
+async def probe_maigret():
+    """Check that the Maigret CLI actually runs, without blocking startup"""
+    global MAIGRET_AVAILABLE
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "python3", "-m", "maigret.maigret", "--version",
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=PARENT_PATH,
+            env=MAIGRET_ENV
+        )
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=30)
+        except asyncio.TimeoutError:
+            proc.kill()
+            raise
+        MAIGRET_AVAILABLE = proc.returncode == 0
+    except Exception as e:
+        logger.warning(f"Maigret availability probe failed: {e}")
+        MAIGRET_AVAILABLE = False
+    if not MAIGRET_AVAILABLE:
+        logger.warning("Maigret unavailable — searches will use the mock path")
+
+# The Maigret checkout lives one directory up; the subprocess cwd and its
+# PYTHONPATH are constant for the process lifetime, so build them once
+PARENT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+MAIGRET_ENV = {**os.environ, 'PYTHONPATH': PARENT_PATH + os.pathsep + os.environ.get('PYTHONPATH', '')}
+
+# Opt-in in-process engine: import maigret as a library instead of forking a
+# fresh interpreter per search. Saves interpreter startup, module import and
+# the report-file round-trip; the subprocess path stays the default fallback.
+MAIGRET_IN_PROCESS = os.getenv("MAIGRET_IN_PROCESS") == "1"
+
+_maigret_db = None
+
+def _get_maigret_db():
+    """Load the bundled Maigret site database once per process"""
+    global _maigret_db
+    if _maigret_db is None:
+        from maigret.sites import MaigretDatabase
+        db_path = os.path.join(PARENT_PATH, "maigret", "resources", "data.json")
+        _maigret_db = MaigretDatabase().load_from_path(db_path)
+    return _maigret_db
+
+# Cap concurrent Maigret subprocesses — each one is a full Python interpreter
+# loading the 3000+ site database, so unbounded fan-out can OOM a small box.
+# Excess searches wait in "queued" status until a slot frees up.
+MAIGRET_SEM = asyncio.Semaphore(int(os.getenv("MAIGRET_MAX_CONCURRENCY", "2")))
 
 @app.get("/api/health")
 async def health_check():
@@ -167,59 +481,76 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
         logger.error(f"WebSocket error for session {session_id}: {e}")
         manager.disconnect(session_id)
 
+# The sites/tags data is effectively static for the process lifetime; cache
+# it with a TTL so repeat polls don't re-fork a Maigret subprocess each time.
+# Alongside the parsed payload we keep the response preserialized as bytes —
+# cache hits then skip pydantic validation and JSON encoding entirely, and a
+# Cache-Control header lets browsers skip the round-trip altogether.
+SITES_TTL = 3600
+_sites_cache = {"data": None, "body": None, "ts": 0.0}
+_tags_cache = {"body": None, "ts": 0.0}
+_STATIC_CACHE_HEADERS = {"Cache-Control": "public, max-age=3600"}
+
+def _fill_sites_cache(data: dict):
+    """Store the sites payload plus preserialized sites/tags response bytes"""
+    now = time.time()
+    _sites_cache["data"] = data
+    _sites_cache["body"] = orjson.dumps({"success": True, "data": data})
+    _sites_cache["ts"] = now
+    _tags_cache["body"] = orjson.dumps({"success": True, "data": data["tags"]})
+    _tags_cache["ts"] = now
+
+def _compute_sites_data() -> Optional[dict]:
+    """Build the /api/sites payload from the bundled Maigret site database
+
+    Reading data.json directly takes milliseconds versus the seconds a
+    python3 -m maigret.maigret --stats subprocess costs, and exposes the
+    real 3000+ site list instead of a hardcoded sample.
+    """
+    db_path = os.path.join(PARENT_PATH, "maigret", "resources", "data.json")
+    try:
+        with open(db_path, 'rb') as f:
+            db = orjson.loads(f.read())
+    except Exception as e:
+        logger.error(f"Failed to load Maigret site database: {e}")
+        return None
+
+    sites = [
+        {"name": name, "urlMain": site.get("urlMain", ""), "tags": site.get("tags", [])}
+        for name, site in db.get("sites", {}).items()
+    ]
+    tags = db.get("tags") or sorted({tag for site in db.get("sites", {}).values() for tag in site.get("tags", [])})
+
+    return {"sites": sites, "total": len(sites), "tags": tags}
+
+@app.on_event("startup")
+async def warm_sites_cache():
+    """Populate the sites cache once at startup so no client pays for it"""
+    async def _warm():
+        try:
+            data = await asyncio.to_thread(_compute_sites_data)
+            if data is not None:
+                _fill_sites_cache(data)
+        except Exception as e:
+            logger.warning(f"Failed to warm sites cache: {e}")
+
+    asyncio.create_task(_warm())
+
 @app.get("/api/sites")
 async def get_sites():
     """Get available sites for searching"""
     try:
-        if MAIGRET_AVAILABLE:
-            # Run Maigret with --stats to get site information
-            parent_path = os.path.join(os.path.dirname(__file__), '..')
-            result = subprocess.run(
-                ["python3", "-m", "maigret.maigret", "--stats"],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                cwd=parent_path
-            )
-            
-            if result.returncode == 0:
-                # Parse the stats output to get site information
-                # For now, return a basic structure
-                return SearchResponse(
-                    success=True,
-                    data={
-                        "sites": [
-                            {"name": "github", "urlMain": "https://github.com", "tags": ["coding", "tech"]},
-                            {"name": "twitter", "urlMain": "https://twitter.com", "tags": ["social", "news"]},
-                            {"name": "instagram", "urlMain": "https://instagram.com", "tags": ["photo", "social"]},
-                            {"name": "linkedin", "urlMain": "https://linkedin.com", "tags": ["professional", "social"]},
-                            {"name": "facebook", "urlMain": "https://facebook.com", "tags": ["social"]},
-                            {"name": "reddit", "urlMain": "https://reddit.com", "tags": ["social", "forum"]},
-                            {"name": "youtube", "urlMain": "https://youtube.com", "tags": ["video", "social"]},
-                            {"name": "tiktok", "urlMain": "https://tiktok.com", "tags": ["video", "social"]},
-                            {"name": "discord", "urlMain": "https://discord.com", "tags": ["gaming", "social"]},
-                            {"name": "steam", "urlMain": "https://steamcommunity.com", "tags": ["gaming"]},
-                        ],
-                        "total": 10,
-                        "tags": ["coding", "tech", "social", "news", "photo", "professional", "forum", "video", "gaming"]
-                    }
-                )
-            else:
-                return SearchResponse(success=False, error="Failed to get site statistics")
-        else:
-            # Mock data
-            return SearchResponse(
-                success=True,
-                data={
-                    "sites": [
-                        {"name": "github", "urlMain": "https://github.com", "tags": ["coding", "tech"]},
-                        {"name": "twitter", "urlMain": "https://twitter.com", "tags": ["social", "news"]},
-                        {"name": "instagram", "urlMain": "https://instagram.com", "tags": ["photo", "social"]},
-                    ],
-                    "total": 3,
-                    "tags": ["coding", "tech", "social", "news", "photo"]
-                }
-            )
+        if _sites_cache["body"] is not None and time.time() - _sites_cache["ts"] < SITES_TTL:
+            return Response(_sites_cache["body"], media_type="application/json",
+                            headers=_STATIC_CACHE_HEADERS)
+
+        data = await asyncio.to_thread(_compute_sites_data)
+        if data is None:
+            return SearchResponse(success=False, error="Failed to get site statistics")
+
+        _fill_sites_cache(data)
+        return Response(_sites_cache["body"], media_type="application/json",
+                        headers=_STATIC_CACHE_HEADERS)
     except Exception as e:
         return SearchResponse(success=False, error=str(e))
 
@@ -227,17 +558,16 @@ async def get_sites():
 async def get_tags():
     """Get available tags"""
     try:
-        if MAIGRET_AVAILABLE:
-            # Return common tags
-            return SearchResponse(
-                success=True,
-                data=["gaming", "coding", "photo", "music", "blog", "finance", "social", "tech", "news", "professional", "forum", "video"]
-            )
-        else:
-            return SearchResponse(
-                success=True,
-                data=["gaming", "coding", "photo", "music", "blog", "finance", "social"]
-            )
+        # Tags come from the same site database as /api/sites, so filling
+        # the sites cache preserializes this response as a side effect.
+        if _tags_cache["body"] is None or time.time() - _tags_cache["ts"] >= SITES_TTL:
+            sites_data = await asyncio.to_thread(_compute_sites_data)
+            if sites_data is None:
+                return SearchResponse(success=False, error="Failed to get site tags")
+            _fill_sites_cache(sites_data)
+
+        return Response(_tags_cache["body"], media_type="application/json",
+                        headers=_STATIC_CACHE_HEADERS)
     except Exception as e:
         return SearchResponse(success=False, error=str(e))
 
@@ -259,21 +589,159 @@ async def start_search(request: SearchRequest):
         }
         
         search_sessions[session_id] = session
-        save_sessions() # Save session after creation
+        save_session(session_id)  # Save session after creation
+        evict_old_sessions()
         
         # Start the search in a background task
         if MAIGRET_AVAILABLE:
-            asyncio.create_task(perform_maigret_search(session_id, request))
+            if MAIGRET_IN_PROCESS:
+                asyncio.create_task(perform_library_search(session_id, request))
+            else:
+                asyncio.create_task(perform_maigret_search(session_id, request))
         else:
             # Mock search results with WebSocket support
             asyncio.create_task(mock_search(session_id, request))
         
-        return SearchResponse(success=True, data=session)
+        # Plain dict: ORJSONResponse serializes it directly, with no pydantic
+        # re-validation of the session payload on the way out
+        return {"success": True, "data": session}
     except Exception as e:
-        return SearchResponse(success=False, error=str(e))
+        return {"success": False, "error": str(e)}
+
+async def perform_library_search(session_id: str, request: SearchRequest):
+    """Perform a Maigret search in-process via the library API
+
+    Used when MAIGRET_IN_PROCESS=1: no subprocess fork, no stdout scraping
+    and no report-file round-trip — results come back as Python objects.
+    """
+    import maigret
+
+    update_session_data(session_id, {"status": "queued"})
+    await MAIGRET_SEM.acquire()
+    try:
+        update_session_data(session_id, {
+            "status": "running",
+            "progress": 0,
+            "currentSite": "Loading site database...",
+            "sitesChecked": 0,
+            "totalSites": 0,
+            "resultsFound": 0
+        })
+
+        db = await asyncio.to_thread(_get_maigret_db)
+        site_dict = db.ranked_sites_dict(
+            top=sys.maxsize if request.options.allSites else (request.options.topSites or 500),
+            tags=request.options.tags,
+            names=request.options.siteList,
+        )
+
+        total_sites = len(site_dict) * len(request.usernames)
+        update_session_data(session_id, {"totalSites": total_sites, "progress": 5})
+
+        formatted_results = []
+        results_found = 0
+        for i, username in enumerate(request.usernames):
+            update_session_data(session_id, {"currentSite": f"Searching {username}..."})
+
+            results = await maigret.search(
+                username=username,
+                site_dict=site_dict,
+                logger=logger,
+                timeout=request.options.timeout or 30,
+                is_parsing_enabled=not request.options.disableExtracting,
+                proxy=request.options.proxy,
+                tor_proxy=request.options.torProxy,
+                i2p_proxy=request.options.i2pProxy,
+                no_progressbar=True,
+            )
+
+            sites = []
+            for site_name, site_result in results.items():
+                status = site_result.get("status")
+                if status is None:
+                    continue
+                site_obj = site_result.get("site")
+                sites.append(_to_site_result(site_name, {
+                    "status": status.json(),
+                    "url_main": site_result.get("url_main", ""),
+                    "url_user": site_result.get("url_user", ""),
+                    "tags": site_obj.tags if site_obj else [],
+                }))
+                if status.is_found():
+                    results_found += 1
+
+            formatted_results.append({
+                "username": username,
+                "sites": sites,
+                "extractedData": {},
+                "networkGraph": []
+            })
+
+            progress = min(95, int(((i + 1) / len(request.usernames)) * 95))
+            update_session_data(session_id, {
+                "progress": progress,
+                "sitesChecked": len(site_dict) * (i + 1),
+                "resultsFound": results_found
+            })
+
+        update_session_data(session_id, {
+            "results": formatted_results,
+            "status": "completed",
+            "progress": 100,
+            "completedAt": datetime.now().isoformat()
+        })
+
+        await manager.send_progress_update(session_id, {
+            "type": "completed",
+            "data": {
+                "sessionId": session_id,
+                "status": "completed",
+                "progress": 100,
+                "results": formatted_results
+            }
+        })
+
+        logger.info(f"Library search completed for session {session_id} with {len(formatted_results)} users")
+    except Exception as e:
+        logger.error(f"Library search error for session {session_id}: {e}")
+        update_session_data(session_id, {
+            "status": "failed",
+            "error": str(e)
+        })
+
+        await manager.send_progress_update(session_id, {
+            "type": "failed",
+            "data": {
+                "sessionId": session_id,
+                "status": "failed",
+                "error": str(e)
+            }
+        })
+    finally:
+        MAIGRET_SEM.release()
 
 async def perform_maigret_search(session_id: str, request: SearchRequest):
     """Perform actual Maigret search using subprocess with real-time progress tracking"""
+    update_session_data(session_id, {"status": "queued"})
+    await MAIGRET_SEM.acquire()
+
+    # Explicit sentinels for the cleanup path instead of probing locals()
+    process = None
+    report_dir = None
+    sender_task = None
+
+    async def _fail(error_msg: str):
+        """Mark the session failed and push the terminal WebSocket frame"""
+        update_session_data(session_id, {"status": "failed", "error": error_msg})
+        await manager.send_progress_update(session_id, {
+            "type": "failed",
+            "data": {
+                "sessionId": session_id,
+                "status": "failed",
+                "error": error_msg
+            }
+        })
+
     try:
         # Update session status using thread-safe method
         update_session_data(session_id, {
@@ -293,51 +761,13 @@ async def perform_maigret_search(session_id: str, request: SearchRequest):
             "currentSite": "Preparing search..."
         })
         
-        # Build Maigret command
-        parent_path = os.path.join(os.path.dirname(__file__), '..')
-        cmd = ["python3", "-m", "maigret.maigret"]
-        
-        # Add options
-        if request.options.timeout:
-            cmd.extend(["--timeout", str(request.options.timeout)])
-        
-        if request.options.allSites:
-            cmd.append("--all-sites")
-        elif request.options.topSites:
-            cmd.extend(["--top-sites", str(request.options.topSites)])
-        
-        if request.options.tags:
-            cmd.extend(["--tags", ",".join(request.options.tags)])
-        
-        if request.options.siteList:
-            for site in request.options.siteList:
-                cmd.extend(["--site", site])
-        
-        if request.options.disableRecursiveSearch:
-            cmd.append("--no-recursion")
-        
-        if request.options.disableExtracting:
-            cmd.append("--no-extracting")
-        
-        if request.options.proxy:
-            cmd.extend(["--proxy", request.options.proxy])
-        
-        if request.options.torProxy:
-            cmd.extend(["--tor-proxy", request.options.torProxy])
-        
-        if request.options.i2pProxy:
-            cmd.extend(["--i2p-proxy", request.options.i2pProxy])
-        
-        # Add verbose output for progress tracking
-        cmd.append("--verbose")
-        
-        # Add JSON output
-        cmd.extend(["--json", "simple"])
-        
-        # Add usernames
-        cmd.extend(request.usernames)
-        
-        logger.debug(f"Running command: {' '.join(cmd)}")
+        # Build Maigret command; reports go to a per-search temp directory
+        # (no stale files, no collisions between concurrent searches)
+        report_dir = tempfile.mkdtemp(prefix="maigret-reports-")
+        cmd = build_maigret_cmd(request.options, request.usernames, report_dir)
+
+        # Lazy %-formatting: the argv list is only stringified if DEBUG is on
+        logger.debug("Running command: %s", cmd)
         
         # Update progress to show command preparation
         update_session_data(session_id, {
@@ -345,30 +775,53 @@ async def perform_maigret_search(session_id: str, request: SearchRequest):
             "currentSite": "Starting search process..."
         })
         
-        # Run Maigret with real-time output capture
-        env = os.environ.copy()
-        env['PYTHONPATH'] = parent_path + ':' + env.get('PYTHONPATH', '')
-        
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            universal_newlines=True,
-            cwd=parent_path,
-            env=env
+        # Async subprocess so the readline below yields to the event loop
+        # instead of blocking every other request for the whole search
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            cwd=PARENT_PATH,
+            env=MAIGRET_ENV
         )
-        
+
         # Track progress from output
         total_sites = 0
         sites_checked = 0
         results_found = 0
         current_site = "Initializing..."
         last_progress_update = 0
-        
+        last_sent_frame = None
+
+        # The session is touched on every line, so it stays resident for the
+        # whole search; read through one reference instead of a per-line
+        # lookup (writes still go via update_session_data for dirty tracking)
+        session = search_sessions[session_id]
+
+        # Progress frames go through a small bounded queue drained by its own
+        # task so a slow WebSocket client can never backpressure the stdout
+        # reads below — if the pipe fills, Maigret itself wedges. On overflow
+        # the oldest frame is dropped; only the latest progress matters.
+        progress_queue: asyncio.Queue = asyncio.Queue(maxsize=4)
+
+        async def drain_progress_queue():
+            while True:
+                frame = await progress_queue.get()
+                await manager.send_progress_update(session_id, frame)
+
+        sender_task = asyncio.create_task(drain_progress_queue())
+
+        def queue_progress_frame(frame: dict):
+            try:
+                progress_queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                try:
+                    progress_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+                progress_queue.put_nowait(frame)
+
         # Read output in real-time with timeout
-        import time
         start_time = time.time()
         # Use much larger timeout for all-sites searches; these can take a long time
         base_timeout = request.options.timeout or 30
@@ -378,7 +831,7 @@ async def perform_maigret_search(session_id: str, request: SearchRequest):
         
         # Update progress more frequently and ensure we always have some progress
         async def update_progress():
-            nonlocal last_progress_update
+            nonlocal last_progress_update, last_sent_frame
             current_time = time.time()
             if current_time - last_progress_update >= 0.5:  # Update every 500ms
                 # Calculate progress based on available information
@@ -392,7 +845,15 @@ async def perform_maigret_search(session_id: str, request: SearchRequest):
                     min_progress = max(2, int((elapsed_time / 5) * 3))  # 3% per 5 seconds initially
                     estimated_progress = min(90, min_progress)
                     progress = estimated_progress
-                
+
+                # Intermediate frames carry no new information when nothing
+                # parsed since the last tick — skip the encode and the send
+                frame = (progress, current_site, sites_checked, total_sites, results_found)
+                if frame == last_sent_frame:
+                    last_progress_update = current_time
+                    return
+                last_sent_frame = frame
+
                 # Use thread-safe session update
                 update_session_data(session_id, {
                     "progress": progress,
@@ -402,13 +863,12 @@ async def perform_maigret_search(session_id: str, request: SearchRequest):
                     "currentSite": current_site
                 })
                 
-                # Send real-time update via WebSocket
-                session_data = get_session_data(session_id)
-                await manager.send_progress_update(session_id, {
+                # Hand the frame to the sender task; never await a client here
+                queue_progress_frame({
                     "type": "progress",
                     "data": {
                         "sessionId": session_id,
-                        "status": session_data.get("status", "running"),
+                        "status": session.get("status", "running"),
                         "progress": progress,
                         "currentSite": current_site,
                         "sitesChecked": sites_checked,
@@ -425,30 +885,31 @@ async def perform_maigret_search(session_id: str, request: SearchRequest):
             "currentSite": "Searching sites..."
         })
         
+        # The event loop enforces the deadline: readline wakes on either a
+        # line or timeout, so a silent/hung Maigret is reaped immediately
+        # instead of at the next line.
+        deadline = time.monotonic() + timeout_seconds
         while True:
-            # Check for timeout
-            if time.time() - start_time > timeout_seconds:
+            try:
+                output = await asyncio.wait_for(
+                    process.stdout.readline(),
+                    timeout=deadline - time.monotonic()
+                )
+            except asyncio.TimeoutError:
                 logger.error(f"Search timeout after {timeout_seconds} seconds")
                 process.terminate()
-                update_session_data(session_id, {
-                    "status": "failed",
-                    "error": "Search timed out"
-                })
+                await _fail("Search timed out")
                 return
-            
-            output = process.stdout.readline()
-            if output == '' and process.poll() is not None:
+            if not output:
                 break
-            if output:
-                line = output.strip()
-                logger.debug(f"Maigret output: {line}")
-                
-                # Parse progress information from output
-                import re
+            line = output.decode('utf-8', 'replace').strip()
+            if line:
+                # Lazy %-formatting: skipped entirely unless DEBUG is enabled
+                logger.debug("Maigret output: %s", line)
                 
                 # Look for initialization messages
                 if "sites" in line.lower() and ("searching" in line.lower() or "found" in line.lower()):
-                    sites_match = re.search(r'(\d+)\s+sites?', line, re.IGNORECASE)
+                    sites_match = SITES_COUNT_RE.search(line)
                     if sites_match and total_sites == 0:
                         total_sites = int(sites_match.group(1))
                         update_session_data(session_id, {
@@ -458,126 +919,86 @@ async def perform_maigret_search(session_id: str, request: SearchRequest):
                         })
                         logger.debug(f"Found total sites: {total_sites}")
                 
-                # Look for progress bar updates (multiple formats)
-                progress_patterns = [
-                    r'Searching\s+\|[█░]+\|\s+(\d+)/(\d+)',
-                    r'(\d+)/(\d+)\s+\[[█░]+\]',
-                    r'(\d+)/(\d+)\s+\[[= ]+\]',
-                    r'(\d+)/(\d+)\s+\[[# ]+\]',
-                    r'Progress:\s+(\d+)/(\d+)',
-                    r'(\d+)/(\d+)\s+sites?',
-                    # Add pattern for the format we're seeing in logs
-                    r'Searching\s+\|[█░]+\|\s*(\d+)/(\d+)',
-                    # Add pattern for the format: 494/500 [99%]
-                    r'(\d+)/(\d+)\s+\[(\d+)%\]',
-                ]
-                
-                for pattern in progress_patterns:
-                    progress_match = re.search(pattern, line)
-                    if progress_match:
-                        if len(progress_match.groups()) == 3:  # Format: 494/500 [99%]
-                            sites_checked = int(progress_match.group(1))
-                            total_sites = int(progress_match.group(2))
-                            progress_percent = int(progress_match.group(3))
-                        else:  # Other formats
-                            sites_checked = int(progress_match.group(1))
+                # Single pass over the line; each category fires at most once.
+                # The prefilter skips the regex for lines that can't match.
+                matched_progress = matched_bar = matched_site = matched_result = False
+                for m in (OUTPUT_LINE_RE.finditer(line) if _line_can_match(line) else ()):
+                    if m.group('progress') and not matched_progress:
+                        matched_progress = True
+                        sites_checked = int(m.group('done') or m.group('done2'))
+                        pct = m.group('pct')
+                        if pct is not None:  # Format: 494/500 [99%]
+                            total_sites = int(m.group('total2'))
+                            progress_percent = int(pct)
+                        else:
                             if total_sites == 0:
-                                total_sites = int(progress_match.group(2))
+                                total_sites = int(m.group('total') or m.group('total2'))
                             progress_percent = min(95, int((sites_checked / max(total_sites, 1)) * 100))
-                        
-                        update_session_data(session_id, {
-                            "totalSites": total_sites,
-                            "sitesChecked": sites_checked,
-                            "progress": progress_percent
-                        })
-                        logger.debug(f"Progress update: {sites_checked}/{total_sites} ({progress_percent}%)")
-                        break
-                
-                # Also look for progress bar patterns without numbers (like the one in logs)
-                if 'Searching |' in line and '|' in line:
-                    # Extract progress from visual progress bar
-                    bar_match = re.search(r'Searching\s+\|([█░]+)\|', line)
-                    if bar_match:
-                        bar = bar_match.group(1)
-                        filled = bar.count('█')
-                        total_length = len(bar)
-                        if total_length > 0:
-                            # Estimate progress from visual bar
-                            estimated_progress = min(95, int((filled / total_length) * 100))
-                            session_data = get_session_data(session_id)
-                            if estimated_progress > session_data.get("progress", 0):
-                                update_session_data(session_id, {
-                                    "progress": estimated_progress,
-                                    "currentSite": f"Site {sites_checked + 1}" if sites_checked > 0 else "Processing sites..."
-                                })
-                                logger.debug(f"Visual progress update: {estimated_progress}%")
-                
-                # Look for site checking messages
-                site_check_patterns = [
-                    r'Checking\s+([^.\s]+)',
-                    r'Searching\s+([^.\s]+)',
-                    r'Testing\s+([^.\s]+)',
-                    r'\[([^\]]+)\]\s+Checking',
-                    r'\[([^\]]+)\]\s+Searching',
-                ]
-                
-                for pattern in site_check_patterns:
-                    site_match = re.search(pattern, line)
-                    if site_match:
-                        current_site = site_match.group(1)
-                        update_session_data(session_id, {"currentSite": current_site})
-                        logger.debug(f"Currently checking: {current_site}")
-                        break
-                
+
+                        # Progress-bar redraws repeat the same counters many
+                        # times; only touch the session when something moved
+                        if (sites_checked != session.get("sitesChecked")
+                                or total_sites != session.get("totalSites")
+                                or progress_percent != session.get("progress")):
+                            update_session_data(session_id, {
+                                "totalSites": total_sites,
+                                "sitesChecked": sites_checked,
+                                "progress": progress_percent
+                            })
+                            logger.debug("Progress update: %d/%d (%d%%)", sites_checked, total_sites, progress_percent)
+                    elif m.group('bar') and not matched_bar:
+                        matched_bar = True
+                        # Estimate progress from the visual progress bar
+                        bar = m.group('fill')
+                        estimated_progress = min(95, int((bar.count('█') / len(bar)) * 100))
+                        if estimated_progress > session.get("progress", 0):
+                            update_session_data(session_id, {
+                                "progress": estimated_progress,
+                                "currentSite": f"Site {sites_checked + 1}" if sites_checked > 0 else "Processing sites..."
+                            })
+                            logger.debug("Visual progress update: %d%%", estimated_progress)
+                    elif m.group('site') and not matched_site:
+                        matched_site = True
+                        current_site = m.group('site_name') or m.group('bracket_site')
+                        if current_site != session.get("currentSite"):
+                            update_session_data(session_id, {"currentSite": current_site})
+                            logger.debug("Currently checking: %s", current_site)
+                    elif m.group('result') and not matched_result:
+                        matched_result = True
+                        results_found += 1
+                        update_session_data(session_id, {"resultsFound": results_found})
+                        logger.debug("Result found! Total: %d", results_found)
+
                 # If no specific site found, but we have progress, show a generic message
-                if not any(re.search(pattern, line) for pattern in site_check_patterns) and sites_checked > 0:
+                if not matched_site and sites_checked > 0:
                     if not current_site or current_site == "Initializing...":
                         current_site = f"Site {sites_checked}"
                         update_session_data(session_id, {"currentSite": current_site})
-                
+
                 # If we're still in initializing phase but have been running for a while, show activity
                 if current_site == "Initializing..." and time.time() - start_time > 3:
                     current_site = "Preparing search environment..."
-                    session_data = get_session_data(session_id)
                     update_session_data(session_id, {
                         "currentSite": current_site,
-                        "progress": max(session_data.get("progress", 0), 4)
+                        "progress": max(session.get("progress", 0), 4)
                     })
                 
-                # Look for found results
-                result_patterns = [
-                    r'Found!',
-                    r'Claimed',
-                    r'✓',
-                    r'\[FOUND\]',
-                    r'\[CLAIMED\]',
-                    r'Success',
-                ]
-                
-                for pattern in result_patterns:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        results_found += 1
-                        update_session_data(session_id, {"resultsFound": results_found})
-                        logger.info(f"Result found! Total: {results_found}")
-                        break
-                
                 # Update progress periodically
                 await update_progress()
                 
                 # Ensure we have some progress even if parsing fails
-                session_data = get_session_data(session_id)
-                if session_data.get("progress", 0) < 3 and time.time() - start_time > 2:
+                if session.get("progress", 0) < 3 and time.time() - start_time > 2:
                     update_session_data(session_id, {
                         "progress": 3,
                         "currentSite": "Starting search process..."
                     })
         
-        # Wait for process to complete
-        return_code = process.wait()
+        # After EOF the process has usually already exited; only await the
+        # reap if the return code isn't known yet
+        return_code = process.returncode if process.returncode is not None else await process.wait()
         
         # Final progress update
-        session_data = get_session_data(session_id)
-        if session_data.get("progress", 0) < 95 and session_data.get("status") == "running":
+        if session.get("progress", 0) < 95 and session.get("status") == "running":
             update_session_data(session_id, {
                 "progress": 95,
                 "currentSite": "Processing results..."
@@ -587,64 +1008,14 @@ async def perform_maigret_search(session_id: str, request: SearchRequest):
             # Parse JSON results from the generated file
             try:
                 logger.info(f"Maigret search completed successfully for session {session_id}")
-                # Maigret saves results to a JSON file in the reports directory
-                all_results = []
-                
-                for username in request.usernames:
-                    # Look for the JSON file for this username
-                    json_filename = f"report_{username}_simple.json"
-                    json_path = os.path.join(parent_path, "reports", json_filename)
-                    
-                    logger.debug(f"Looking for JSON file: {json_path}")
-                    
-                    if os.path.exists(json_path):
-                        logger.debug(f"Found JSON file for {username}")
-                        with open(json_path, 'r') as f:
-                            data = json.load(f)
-                            all_results.append(data)
-                            logger.debug(f"Loaded data for {username}: {len(data)} sites")
-                    else:
-                        logger.warning(f"JSON file not found for {username}: {json_path}")
-                        # If file doesn't exist, create empty result
-                        all_results.append({"username": username, "sites": {}})
-                
-                logger.debug(f"Processing {len(all_results)} result sets")
-                
-                # Convert to our format
-                formatted_results = []
-                for username in request.usernames:
-                    user_results = {
-                        "username": username,
-                        "sites": [],
-                        "extractedData": {},
-                        "networkGraph": []
-                    }
-                    
-                    # Find results for this username
-                    for result_data in all_results:
-                        if isinstance(result_data, dict):
-                            # The result_data is the sites dict directly (e.g., {"YouTube": {...}, "YouTube User": {...}})
-                            logger.debug(f"Processing result data with {len(result_data)} sites")
-                            for site_name, site_data in result_data.items():
-                                if isinstance(site_data, dict) and "status" in site_data:
-                                    status = site_data.get("status", {})
-                                    # Normalize status to match frontend expectations
-                                    raw_status = status.get("status", "unknown") if isinstance(status, dict) else str(status)
-                                    normalized_status = raw_status.title() if raw_status.lower() in ["claimed", "unclaimed"] else raw_status
-                                    
-                                    site_result = {
-                                        "siteName": site_name,
-                                        "url": site_data.get("url_main", ""),
-                                        "status": normalized_status,
-                                        "tags": site_data.get("tags", []) if "tags" in site_data else [],
-                                        "metadata": site_data.get("metadata", {}),
-                                        "urlUser": site_data.get("url_user", "")
-                                    }
-                                    user_results["sites"].append(site_result)
-                                    logger.debug(f"Added site {site_name} with status {site_result['status']}")
-                    
-                    formatted_results.append(user_results)
-                    logger.debug(f"Formatted results for {username}: {len(user_results['sites'])} sites")
+                # The per-username reports are independent files, so parse
+                # them concurrently in worker threads. Each load still
+                # streams its report through ijson (see _load_user_results).
+                report_paths = _find_user_reports(report_dir, request.usernames)
+                formatted_results = list(await asyncio.gather(*[
+                    asyncio.to_thread(_load_user_results, username, report_paths.get(username))
+                    for username in request.usernames
+                ]))
                 
                 update_session_data(session_id, {
                     "results": formatted_results,
@@ -654,9 +1025,10 @@ async def perform_maigret_search(session_id: str, request: SearchRequest):
                 })
                 
                 # Send completion notification via WebSocket
-                logger.debug(f"About to send WebSocket completion message for session {session_id}")
-                logger.debug(f"Active WebSocket connections: {list(manager.active_connections.keys())}")
-                
+                logger.debug("About to send WebSocket completion message for session %s", session_id)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Active WebSocket connections: %s", list(manager.active_connections))
+
                 completion_message = {
                     "type": "completed",
                     "data": {
@@ -666,11 +1038,12 @@ async def perform_maigret_search(session_id: str, request: SearchRequest):
                         "results": formatted_results
                     }
                 }
-                logger.debug(f"Completion message to send: {completion_message}")
-                
+                # Lazy: stringifying the full result set is expensive
+                logger.debug("Completion message to send: %s", completion_message)
+
                 try:
                     await manager.send_progress_update(session_id, completion_message)
-                    logger.debug(f"Successfully sent completion message to session {session_id}")
+                    logger.debug("Successfully sent completion message to session %s", session_id)
                 except Exception as e:
                     logger.error(f"Failed to send completion message to session {session_id}: {e}")
                     # Try to send via HTTP polling as fallback
@@ -678,107 +1051,54 @@ async def perform_maigret_search(session_id: str, request: SearchRequest):
                 
                 logger.info(f"Search completed for session {session_id} with {len(formatted_results)} users")
                 
-            except json.JSONDecodeError as e:
+            except (json.JSONDecodeError, ijson.JSONError) as e:
                 logger.error(f"Failed to parse Maigret output: {e}")
-                update_session_data(session_id, {
-                    "status": "failed",
-                    "error": f"Failed to parse results: {e}"
-                })
-                
-                # Send failure notification via WebSocket
-                await manager.send_progress_update(session_id, {
-                    "type": "failed",
-                    "data": {
-                        "sessionId": session_id,
-                        "status": "failed",
-                        "error": f"Failed to parse results: {e}"
-                    }
-                })
+                await _fail(f"Failed to parse results: {e}")
             except Exception as e:
                 logger.error(f"Failed to process Maigret results: {e}")
-                update_session_data(session_id, {
-                    "status": "failed",
-                    "error": f"Failed to process results: {e}"
-                })
-                
-                # Send failure notification via WebSocket
-                await manager.send_progress_update(session_id, {
-                    "type": "failed",
-                    "data": {
-                        "sessionId": session_id,
-                        "status": "failed",
-                        "error": f"Failed to process results: {e}"
-                    }
-                })
+                await _fail(f"Failed to process results: {e}")
         else:
             logger.error(f"Maigret search failed with return code: {return_code}")
-            update_session_data(session_id, {
-                "status": "failed",
-                "error": f"Maigret search failed with return code: {return_code}"
-            })
-            
-            # Send failure notification via WebSocket
-            await manager.send_progress_update(session_id, {
-                "type": "failed",
-                "data": {
-                    "sessionId": session_id,
-                    "status": "failed",
-                    "error": f"Maigret search failed with return code: {return_code}"
-                }
-            })
-        
-    except subprocess.TimeoutExpired:
-        logger.error(f"Maigret search timed out for session {session_id}")
-        update_session_data(session_id, {
-            "status": "failed",
-            "error": "Search timed out"
-        })
-        
-        # Send timeout notification via WebSocket
-        await manager.send_progress_update(session_id, {
-            "type": "failed",
-            "data": {
-                "sessionId": session_id,
-                "status": "failed",
-                "error": "Search timed out"
-            }
-        })
+            await _fail(f"Maigret search failed with return code: {return_code}")
+
     except Exception as e:
         logger.error(f"Search error for session {session_id}: {e}")
-        update_session_data(session_id, {
-            "status": "failed",
-            "error": str(e)
-        })
-        
-        # Send error notification via WebSocket
-        await manager.send_progress_update(session_id, {
-            "type": "failed",
-            "data": {
-                "sessionId": session_id,
-                "status": "failed",
-                "error": str(e)
-            }
-        })
-        
-        # Ensure process is terminated if it's still running
-        if 'process' in locals() and process.poll() is None:
+        await _fail(str(e))
+    finally:
+        # Reap the subprocess with SIGKILL escalation: a terminate() from the
+        # timeout/error paths may be ignored, which would leak the process
+        if process is not None and process.returncode is None:
             process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                logger.error(f"Maigret process for session {session_id} ignored SIGTERM; killing")
+                process.kill()
+                await process.wait()
+        if sender_task is not None:
+            sender_task.cancel()
+        if report_dir is not None:
+            shutil.rmtree(report_dir, ignore_errors=True)
+        MAIGRET_SEM.release()
 
 @app.get("/api/search/{session_id}")
 async def get_search_status(session_id: str):
     """Get search status"""
-    if session_id not in search_sessions:
-        raise HTTPException(status_code=404, detail="Search session not found")
-    
-    # Use thread-safe session data retrieval
+    now = time.monotonic()
+    cached = _status_cache.get(session_id)
+    if cached is not None and now - cached[0] < STATUS_CACHE_TTL:
+        return Response(cached[1], media_type="application/json")
+
     session = get_session_data(session_id)
-    
-    # Add logging to debug status requests
-    logger.info(f"Status request for session {session_id}: status={session.get('status')}, progress={session.get('progress', 0)}")
-    
-    return SearchResponse(
-        success=True,
-        data={
+    if not session:
+        raise HTTPException(status_code=404, detail="Search session not found")
+
+    logger.debug("Status request for session %s: status=%s, progress=%s",
+                 session_id, session.get('status'), session.get('progress', 0))
+
+    body = orjson.dumps({
+        "success": True,
+        "data": {
             "sessionId": session_id,
             "status": session.get("status", "pending"),
             "progress": session.get("progress", 0),
@@ -787,35 +1107,52 @@ async def get_search_status(session_id: str):
             "totalSites": session.get("totalSites", 0),
             "resultsFound": session.get("resultsFound", 0)
         }
-    )
+    })
+    _status_cache[session_id] = (now, body)
+    return Response(body, media_type="application/json")
 
 @app.get("/api/results/{session_id}")
 async def get_search_results(session_id: str):
     """Get search results"""
-    if session_id not in search_sessions:
+    session = get_session_data(session_id)
+    if not session:
         raise HTTPException(status_code=404, detail="Search session not found")
-    
-    session = search_sessions[session_id]
-    
+
     if session["status"] != "completed":
         raise HTTPException(status_code=400, detail="Search not completed")
-    
-    return SearchResponse(success=True, data=session)
+
+    # The results list can run to many megabytes for all-sites searches;
+    # stream it one username at a time so peak memory stays at one user's
+    # encoded results instead of the whole payload. Every fragment below is
+    # orjson-encoded, so no value ever needs manual escaping.
+    def iter_response():
+        yield b'{"success":true,"data":{"results":['
+        for i, user_results in enumerate(session.get("results", [])):
+            if i:
+                yield b','
+            yield orjson.dumps(user_results, default=str)
+        rest = orjson.dumps({k: v for k, v in session.items() if k != "results"},
+                            default=str)
+        if rest == b'{}':
+            yield b']}}'
+        else:
+            yield b'],' + rest[1:-1] + b'}}'
+
+    return StreamingResponse(iter_response(), media_type="application/json")
 
 @app.post("/api/export")
 async def export_results(session_id: str, format: str):
     """Export search results"""
-    if session_id not in search_sessions:
+    session = get_session_data(session_id)
+    if not session:
         raise HTTPException(status_code=404, detail="Search session not found")
-    
-    session = search_sessions[session_id]
-    
+
     # In a real implementation, you would generate the actual export file
     # For now, return a mock download URL
-    return SearchResponse(
-        success=True,
-        data={"downloadUrl": f"/api/reports/export_{session_id}.{format}"}
-    )
+    return {
+        "success": True,
+        "data": {"downloadUrl": f"/api/reports/export_{session_id}.{format}"}
+    }
 
 @app.get("/api/reports/{filename}")
 async def download_report(filename: str):
@@ -824,10 +1161,14 @@ async def download_report(filename: str):
     # For now, return a mock file
     return {"message": f"Download {filename}"}
 
+# Mock result templates shared across usernames: (siteName, url pattern, tags)
+MOCK_SITE_TEMPLATES = (
+    ("github", "https://github.com/{u}", ("coding", "tech")),
+    ("twitter", "https://twitter.com/{u}", ("social", "news")),
+)
+
 async def mock_search(session_id: str, request: SearchRequest):
     """Mock search process for demo purposes with WebSocket updates"""
-    import asyncio
-    
     # Update session status using thread-safe method
     update_session_data(session_id, {
         "status": "running",
@@ -838,19 +1179,27 @@ async def mock_search(session_id: str, request: SearchRequest):
     })
     
     mock_sites = ["github", "twitter", "instagram", "linkedin", "facebook", "reddit", "youtube", "tiktok", "discord", "steam"]
-    
-    # Simulate search progress with WebSocket updates
-    for i in range(10):
-        await asyncio.sleep(1)
-        
+
+    # Simulate a ~10s search; progress is computed from elapsed time so the
+    # loop only wakes to push updates, and persistence rides the normal
+    # debounced session flush instead of one write per tick
+    duration = 10.0
+    start = time.monotonic()
+    while True:
+        await asyncio.sleep(0.5)
+        elapsed = time.monotonic() - start
+        if elapsed >= duration:
+            break
+
         # Update session data using thread-safe method
-        progress = (i + 1) * 10
-        current_site = mock_sites[i] if i < len(mock_sites) else f"Site {i+1}"
+        progress = min(99, int((elapsed / duration) * 100))
+        sites_checked = min(len(mock_sites), int((elapsed / duration) * len(mock_sites)) + 1)
+        current_site = mock_sites[sites_checked - 1]
         update_session_data(session_id, {
             "progress": progress,
-            "sitesChecked": i + 1,
+            "sitesChecked": sites_checked,
             "currentSite": current_site,
-            "resultsFound": i // 2
+            "resultsFound": sites_checked // 2
         })
         
         # Get updated session data for WebSocket message
@@ -870,35 +1219,32 @@ async def mock_search(session_id: str, request: SearchRequest):
             }
         })
         
-        logger.info(f"Mock search progress: {progress}% - {session_data['currentSite']}")
+        logger.debug("Mock search progress: %d%% - %s", progress, session_data['currentSite'])
     
-    # Generate mock results
+    # Generate mock results from the shared templates: one URL build and one
+    # claimed check per site instead of repeating each f-string and branch
     mock_results = []
     for username in request.usernames:
-        user_results = {
+        claimed = username != "nonexistent"
+        status = "Claimed" if claimed else "Unclaimed"
+        sites = []
+        for site_name, url_template, tags in MOCK_SITE_TEMPLATES:
+            url = url_template.format(u=username)
+            sites.append({
+                "siteName": site_name,
+                "url": url,
+                "status": status,
+                # Immutable and shared across users; serializes as an array
+                "tags": tags,
+                "metadata": {},
+                "urlUser": url if claimed else None
+            })
+        mock_results.append({
             "username": username,
-            "sites": [
-                {
-                    "siteName": "github",
-                    "url": f"https://github.com/{username}",
-                    "status": "Claimed" if username != "nonexistent" else "Unclaimed",
-                    "tags": ["coding", "tech"],
-                    "metadata": {},
-                    "urlUser": f"https://github.com/{username}" if username != "nonexistent" else None
-                },
-                {
-                    "siteName": "twitter",
-                    "url": f"https://twitter.com/{username}",
-                    "status": "Claimed" if username != "nonexistent" else "Unclaimed",
-                    "tags": ["social", "news"],
-                    "metadata": {},
-                    "urlUser": f"https://twitter.com/{username}" if username != "nonexistent" else None
-                }
-            ],
+            "sites": sites,
             "extractedData": {},
             "networkGraph": []
-        }
-        mock_results.append(user_results)
+        })
     
     update_session_data(session_id, {
         "results": mock_results,
@@ -922,4 +1268,6 @@ async def mock_search(session_id: str, request: SearchRequest):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop's subprocess handling avoids the brief loop stall CPython's
+    # watcher can hit while forking Maigret processes under load
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop")